@@ -1,11 +1,13 @@
 """Base class for test harness TestCases that have fixtures."""
 
 # pylint: disable=C0103
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
-from typing import Callable
+from typing import Callable, Dict  # noqa  # pylint: disable=W0611
 
-from simple_test.fixtures import Fixture, PhaseFile, discover_fixtures
+from simple_test.fixtures import Fixture, PhaseFile, \
+    discover_fixtures_by_phase
 from simple_test.runner import Result
 from simple_test.test_case import TestCase
 from simple_test.utils import assertion_context, unified_diff
@@ -56,56 +58,77 @@ if sys.version_info < (3, 6):  # pragma: no cover
         def __init__(cls, name, bases, ns, **kwargs):  # pylint: disable=W0613
             super().__init__(name, bases, ns)
 else:  # pragma: no cover
-    class _PEP487(type):
-        pass
+    # PEP487 is natively supported, so don't layer on an extra metaclass
+    _PEP487 = type
 
 
 class FixturedTestCase(TestCase, metaclass=_PEP487):
     """Base class for test harness TestCases that have fixtures.
 
-    Subclasses should provide the phase_name and run_simple kwargs. Example:
+    Subclasses should provide the phase_name kwarg. Example:
 
-        class ScannerTest(FixturedTestCase, phase_name='scanner',
-                          run_simple=run_simple_scanner):
+        class ScannerTest(FixturedTestCase, phase_name='scanner'):
             # etc.
 
     phase_name is the file extension the harness should look for in the
     fixtures directory. Files with this extension should contain the expected
-    combined stdout/stderr from running this phase of the simple compiler (by
-    calling the provided run_simple function).
+    combined stdout/stderr from running this phase of the simple compiler
+    (using the Runner method named for the phase in PHASE_DISPATCH, unless the
+    subclass overrides run_phase).
     """
+    phase_name = ''  # type: str
+
+    # The name of the Runner method that runs each phase of the simple compiler
+    PHASE_DISPATCH = {
+        'scanner': 'run_scanner',
+        'cst': 'run_cst',
+        'st': 'run_symbol_table',
+        'ast': 'run_ast',
+    }  # type: Dict[str, str]
+
     @classmethod
     def __init_subclass__(cls, phase_name: str) -> None:
         # NOTE: See above, the metaclass hackey to add PEP487 support to python
         #       does not provide a super().__init_subclass__()
         # super().__init_subclass__()
 
+        assert phase_name in cls.PHASE_DISPATCH \
+            or cls.run_phase is not FixturedTestCase.run_phase, \
+            "no runner for phase (override run_phase): {}".format(phase_name)
+
+        cls.phase_name = phase_name
         # Add the test_{fixture.name} methods for each fixture discovered
-        for fixture in discover_fixtures():
-            if fixture.phase_name == phase_name:
-                test_method = _create_test_method(fixture)
-                method_name = "test_{}".format(fixture.name)
-                test_method.__name__ = method_name
+        for fixture in discover_fixtures_by_phase().get(phase_name, []):
+            test_method = _create_test_method(fixture)
+            method_name = "test_{}".format(fixture.name)
+            test_method.__name__ = method_name
 
-                assert not hasattr(cls, method_name), \
-                    "fixture name would replace existing test method: {}" \
-                    .format(method_name)
+            assert not hasattr(cls, method_name), \
+                "fixture name would replace existing test method: {}" \
+                .format(method_name)
 
-                setattr(cls, method_name, test_method)
+            setattr(cls, method_name, test_method)
 
     def run_phase(self, sim_file: Path, as_stdin: bool = False) -> Result:
         """
         Run the appropriate phase of the simple compiler for this test case.
         """
-        raise NotImplementedError
+        method_name = self.PHASE_DISPATCH[self.phase_name]
+        run = getattr(self.runner, method_name)  # type: Callable[..., Result]
+        return run(sim_file, as_stdin)
 
     def assertFixture(self, fixture: Fixture) -> None:
         """
         Asserts that the simple compiler when run under the fixture's phase and
         given the fixture's sim file produces the expected output.
+
+        The compiler is run with the sim file as an argument and as stdin
+        concurrently, since each run is an independent subprocess.
         """
-        self.assertFixtureAsArgument(fixture)
-        self.assertFixtureAsStdin(fixture)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            as_stdin = executor.submit(self.assertFixtureAsStdin, fixture)
+            self.assertFixtureAsArgument(fixture)
+            as_stdin.result()
 
     def assertFixtureAsArgument(self, fixture: Fixture) -> None:
         """
@@ -131,38 +154,39 @@ class FixturedTestCase(TestCase, metaclass=_PEP487):
         """
         # Wrap assertion errors in the exact command to invoke
         # (that can be copied and pasted) for convenience
-        with assertion_context("while running: {}\n\n".format(result.cmd)):
+        with assertion_context("while running: {}\n\n", result.cmd):
             self.assertFixtureStdout(expected, result)
             self.assertFixtureStderr(expected, result)
 
     def assertFixtureStdout(self, expected: PhaseFile, result: Result) -> None:
         """Assert the stdout from the simple compiler matches the expected."""
-        self.assertStdoutEqual(expected.stdout, result.stdout, result.stderr)
+        self.assertStdoutEqual(expected.stdout_bytes, result.stdout,
+                               result.stderr)
 
     def assertFixtureStderr(self, expected: PhaseFile, result: Result) -> None:
         """
         Assert that the simple compiler returned the appropriate errors for
         the given expected output `PhaseFile`.
         """
-        stderr = result.stderr.decode('utf8')
-
+        # Output is checked as bytes, so it only needs to be decoded to
+        # report a failure
         if expected.has_error:
-            if not stderr.startswith('error: '):
+            if not result.stderr.startswith(b'error: '):
                 self.fail("expected stderr to report at least one error\n\n"
                           "stdout was:\n\n{}\n\nstderr was:\n\n{}"
-                          .format(result.stdout.decode('utf8'), stderr))
-        elif stderr != '':
+                          .format(result.stdout.decode('utf8'),
+                                  result.stderr.decode('utf8')))
+        elif result.stderr != b'':
             self.fail("expected no errors to be reported\n\n"
                       "stdout was:\n\n{}\n\nstderr was:\n\n{}"
-                      .format(result.stdout.decode('utf8'), stderr))
+                      .format(result.stdout.decode('utf8'),
+                              result.stderr.decode('utf8')))
 
-    def assertStdoutEqual(self, expected: str, actual: bytes,
+    def assertStdoutEqual(self, expected: bytes, actual: bytes,
                           stderr: bytes) -> None:
         """Assert that actual stdout matches expected stdout."""
-        actual_str = actual.decode('utf8')
-
-        if expected != actual_str:
-            diff = unified_diff(expected, actual_str,
+        if expected != actual:
+            diff = unified_diff(expected.decode('utf8'), actual.decode('utf8'),
                                 fromfile='expected_stdout',
                                 tofile='actual_stdout',
                                 color=sys.stdout.isatty())
@@ -1,75 +1,135 @@
 """Fixture representation and discovery used by the test harness."""
 from collections import defaultdict
+from functools import lru_cache
 from itertools import chain
-from pathlib import Path
-from typing import DefaultDict, Dict, List, NamedTuple, Set  # noqa  # pylint: disable=W0611
+import os
+from operator import attrgetter
+from pathlib import Path, PurePath
+import re
+from typing import DefaultDict, Dict, Iterator, List, NamedTuple, Optional, \
+    Set, Tuple  # noqa  # pylint: disable=W0611
 
 
 FIXTURES = (Path(__file__) / '..' / 'fixtures').resolve()
 
+# Paths to files in the fixtures dir start with this
+_FIXTURES_PREFIX = str(FIXTURES) + os.sep
 
-class Fixture(NamedTuple('Fixture', [('phase_file_path', Path)])):
+# Lines in a phase file that the compiler should print to stderr
+_ERROR_LINE = re.compile(rb'^error: [^\n]*\n?', re.MULTILINE)
+
+
+class Fixture:
     """
     Represents an input sim file that should be fed into the simple compiler
     under test, the phase in which to run the compiler, and the output that
     the harness should expected from this.
+
+    Everything about the fixture that can be derived from its phase file path
+    is computed once up front (the harness reads these many times while
+    registering and running tests):
+
+      - name: the name of the fixture. For fixtures in a subdirectory, the
+        slashes are replaced with underscores (to allow the name to be used as
+        a unittest TestCase test method name). For example, a fixture with
+        phase file 'fixtures/foo/bar.scanner' will be named 'foo_bar'.
+      - phase_name: the compiler phase name the fixture should be run with
+      - sim_file_path: the path to the sim file to pass into the compiler
+      - relative_sim_file_path: the path to the sim file relative to the
+        fixtures dir
+
+    These are derived with plain string operations on the path relative to the
+    fixtures dir instead of pathlib, which is comparatively slow.
     """
-    @property
-    def name(self) -> str:
-        """Returns the name of the fixture.
+    __slots__ = ('phase_file_path', 'name', 'phase_name', 'sim_file_path',
+                 '_relative_stem', '_phase_file')
 
-        For fixtures in a subdirectory, the slashes are replaced with
-        underscores (to allow the name to be used as a unittest TestCase test
-        method name. For example, a fixture with phase file
-        'fixtures/foo/bar.scanner' will be named 'foo_bar'.
+    def __init__(self, phase_file_path: Path,
+                 relative_phase_file_path: Optional[str] = None) -> None:
+        """
+        Creates the fixture for the phase file at phase_file_path. If the path
+        of the phase file relative to the fixtures dir is already known, it
+        can be passed as relative_phase_file_path to save recomputing it.
         """
-        relative_path = str(self._relative_phase_file_path.with_suffix(''))
-        return relative_path.replace('/', '_')
+        if relative_phase_file_path is None:
+            relative_phase_file_path = _relative_to_fixtures(phase_file_path)
 
-    @property
-    def phase_name(self) -> str:
-        """Returns the compiler phase name the fixture should be run with."""
-        return str(self._relative_phase_file_path.suffix[1:])
+        self._relative_stem, _, self.phase_name = \
+            relative_phase_file_path.rpartition('.')
 
-    @property
-    def sim_file_path(self) -> Path:
-        """Returns the path to the sim file to pass into the compiler."""
-        return self.phase_file_path.with_suffix('.sim')
+        self.phase_file_path = phase_file_path
+        self.name = self._relative_stem.replace('/', '_')
+        self.sim_file_path = phase_file_path.with_suffix('.sim')
+        self._phase_file = None  # type: Optional[PhaseFile]
 
     @property
-    def relative_sim_file_path(self) -> Path:
+    def relative_sim_file_path(self) -> PurePath:
         """Returns the path to the sim file relative to the fixtures dir."""
-        return self.sim_file_path.relative_to(FIXTURES)
+        return PurePath(self._relative_stem + '.sim')
 
     @property
     def phase_file(self) -> 'PhaseFile':
-        """Returns the PhaseFile representing the expected compiler output."""
-        return PhaseFile.load(self.phase_file_path)
+        """Returns the PhaseFile representing the expected compiler output.
 
-    @property
-    def _relative_phase_file_path(self) -> Path:
-        return self.phase_file_path.relative_to(FIXTURES)
+        The phase file is only loaded from disk the first time it is needed
+        (each fixture is asserted against at least two compiler runs).
+        """
+        if self._phase_file is None:
+            self._phase_file = PhaseFile.load(self.phase_file_path)
+
+        return self._phase_file
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Fixture):
+            return NotImplemented
+
+        return self.phase_file_path == other.phase_file_path
+
+    def __hash__(self) -> int:
+        return hash(self.phase_file_path)
+
+    def __repr__(self) -> str:
+        return "Fixture({!r})".format(self.phase_file_path)
+
+
+def _relative_to_fixtures(path: Path) -> str:
+    path_str = str(path)
+
+    if not path_str.startswith(_FIXTURES_PREFIX):
+        raise ValueError("{} is not in the fixtures dir".format(path_str))
+
+    return path_str[len(_FIXTURES_PREFIX):]
 
 
 class PhaseFile(NamedTuple('PhaseFile', [('stdout', str),
-                                         ('has_error', bool)])):
+                                         ('has_error', bool),
+                                         ('stdout_bytes', bytes)])):
     """
     The expected output of running a certain phase of the simple compiler under
     test against some sim file (see `Fixture`).
+
+    stdout_bytes is stdout encoded as UTF-8, so that it can be compared
+    directly against the compiler's stdout (without decoding it every time).
     """
     @classmethod
     def load(cls, path: Path) -> 'PhaseFile':
         """Load and return a PhaseFile from the filesystem."""
-        with path.open() as f:
-            stage_output = f.read()
-            output_lines = stage_output.splitlines(keepends=True)
-            stdout = ''.join(filter(lambda l: not l.startswith('error: '),
-                                    output_lines))
-            has_errors = any(l.startswith('error: ') for l in output_lines)
+        stage_output = path.read_bytes()
+
+        # Translate newlines like a text-mode open() would, so phase files
+        # checked out with CRLF line endings still match the compiler output
+        if b'\r' in stage_output:
+            stage_output = stage_output.replace(b'\r\n', b'\n') \
+                .replace(b'\r', b'\n')
+
+        stdout = _ERROR_LINE.sub(b'', stage_output)
+        has_errors = stage_output.startswith(b'error: ') \
+            or b'\nerror: ' in stage_output
 
-            return cls(stdout, has_errors)
+        return cls(stdout.decode('utf8'), has_errors, stdout)
 
 
+@lru_cache(maxsize=1)
 def discover_fixtures() -> List[Fixture]:
     """
     Retrieves a list of `Fixture`s from the fixtures/ directory. A fixture
@@ -89,39 +149,49 @@ def discover_fixtures() -> List[Fixture]:
 
     One sim file can have multiple phase files (each pair produces a separate
     fixture). These fixtures can be organized into directories if desired.
+
+    The fixtures directory is only walked once per process (every
+    `FixturedTestCase` subclass asks for the fixtures when it is created), so
+    callers should treat the returned list as read-only.
     """
-    phase_files = defaultdict(list)  # type: DefaultDict[Path, List[Path]]
-    sim_files = set()  # type: Set[Path]
+    # Both are keyed by the path of the sim file relative to the fixtures dir
+    phase_files = defaultdict(list)  # type: DefaultDict[str, List[Fixture]]
+    sim_files = set()  # type: Set[str]
 
-    for path in filter(lambda p: p.name[0] != '.', FIXTURES.glob('**/*')):
-        if path.is_file():
-            assert path.suffix != '', \
-                "unexpected fixture file: {}".format(path)
+    for entry, relative_path in _walk_files(str(FIXTURES), ''):
+        stem, _, extension = entry.name.rpartition('.')
+        assert stem != '' and extension != '', \
+            "unexpected fixture file: {}".format(entry.path)
 
-            # Organize phase tests by their associated .sim file
-            if path.suffix != '.sim':
-                phase_files[path.with_suffix('.sim')].append(path)
+        # Keep track of sim files (see checks below)
+        if extension == 'sim':
+            sim_files.add(relative_path)
+            continue
 
-            # Keep track of sim files (see assertions below)
-            if path.suffix == '.sim':
-                sim_files.add(path)
+        # Organize phase tests by their associated .sim file
+        relative_sim_path = relative_path[:-len(extension)] + 'sim'
+        phase_files[relative_sim_path] \
+            .append(Fixture(Path(entry.path), relative_path))
 
     # Every fixture not ending in .sim, must have a corresponding .sim file (of
     # the same name, just with the extension changed to .sim). This is an easy
     # mistake to make (ex. due to a typo), so we should check if any needed sim
     # files are missing
-    missing_sim_files = phase_files.keys() - sim_files
+    missing_sim_files = [p for p in phase_files if p not in sim_files]
     assert not missing_sim_files, \
         "these *.sim files have phases, but are missing:\n{}" \
-        .format('\n'.join(map(str, sorted(missing_sim_files))))
+        .format(_format_fixture_paths(missing_sim_files))
 
     # It's also possible to have a .sim file with no associated tests. This may
     # indicate that the tests weren't checked into git, for example.
-    testless_sim_files = sim_files - phase_files.keys()
+    testless_sim_files = [p for p in sim_files if p not in phase_files]
     assert not testless_sim_files, "these *.sim files have no phases:\n{}" \
-        .format('\n'.join(map(str, sorted(testless_sim_files))))
+        .format(_format_fixture_paths(testless_sim_files))
+
+    del sim_files
 
-    fixtures = list(map(Fixture, sorted(chain(*phase_files.values()))))
+    fixtures = sorted(chain.from_iterable(phase_files.values()),
+                      key=attrgetter('phase_file_path'))
 
     # We replace '/' in paths with '_' for the test name. This could allow for
     # a scenario where both a/b and a_b exist. Instead of just having one
@@ -142,3 +212,49 @@ def discover_fixtures() -> List[Fixture]:
         test_names[fixture.name] = fixture
 
     return fixtures
+
+
+def _format_fixture_paths(relative_paths: List[str]) -> str:
+    return '\n'.join(os.path.join(str(FIXTURES), p)
+                     for p in sorted(relative_paths))
+
+
+@lru_cache(maxsize=1)
+def discover_fixtures_by_phase() -> Dict[str, List[Fixture]]:
+    """
+    Retrieves the `Fixture`s from the fixtures/ directory (see
+    `discover_fixtures`) grouped by their phase name. Like `discover_fixtures`,
+    this is only computed once per process and should be treated as read-only.
+    """
+    fixtures_by_phase = \
+        defaultdict(list)  # type: DefaultDict[str, List[Fixture]]
+
+    for fixture in discover_fixtures():
+        fixtures_by_phase[fixture.phase_name].append(fixture)
+
+    return dict(fixtures_by_phase)
+
+
+def _walk_files(directory: str, relative_directory: str) \
+        -> Iterator[Tuple['os.DirEntry[str]', str]]:
+    """
+    Yields every file in directory (recursively) along with its path relative
+    to the directory the walk started in (relative_directory is the path of
+    directory relative to that, with a trailing slash unless it is empty),
+    skipping hidden files and directories. Uses os.scandir so that the file
+    type of each entry comes from the directory listing instead of a separate
+    stat() per path.
+    """
+    # NOTE: The listing is drained up front, because os.scandir iterators can
+    #       only be used as context managers (to close them early) in 3.6+
+    for entry in list(os.scandir(directory)):
+        # Hidden directories are pruned before they are ever listed
+        if entry.name.startswith('.'):
+            continue
+
+        relative_path = relative_directory + entry.name
+
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_files(entry.path, relative_path + '/')
+        elif entry.is_file():
+            yield entry, relative_path
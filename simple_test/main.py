@@ -2,36 +2,57 @@
 
 from argparse import ArgumentParser, ArgumentTypeError, Namespace
 from enum import Enum
-from os import environ
+from functools import partial
+from importlib import import_module
+from os import cpu_count, environ
 from pathlib import Path
 from shlex import quote as shell_quote
 from sys import argv
-from typing import Any, cast, List, Type
+from typing import cast, List, Type
 from unittest import defaultTestLoader, TestSuite, TextTestRunner
 from warnings import warn
 
 
+from simple_test.parallel import ParallelTestSuite
 from simple_test.runner import Runner, BinaryNotFoundError, \
     BinaryNotExecutableError
 from simple_test.test_case import TestCase
-from simple_test.test_scanner import TestScanner
-from simple_test.test_cst import TestCST
-from simple_test.test_symbol_table import TestSymbolTable
-from simple_test.test_ast import TestAST
 
 
 class Phase(Enum):
-    """Enum representing the phases of the compiler that can be tested."""
-    SCANNER = TestScanner
-    CST = TestCST
-    ST = TestSymbolTable
-    AST = TestAST
-
-    def __call__(self, *args: Any, **kwargs: Any) -> TestCase:
-        return cast(TestCase, self.value(*args, **kwargs))
+    """Enum representing the phases of the compiler that can be tested.
+
+    The values are the module:class paths of the TestCases for each phase.
+    These are only imported when a phase is used, because importing one
+    discovers its fixtures and generates all of its test methods.
+    """
+    SCANNER = 'simple_test.test_scanner:TestScanner'
+    CST = 'simple_test.test_cst:TestCST'
+    ST = 'simple_test.test_symbol_table:TestSymbolTable'
+    AST = 'simple_test.test_ast:TestAST'
+
+    @property
+    def test_case(self) -> Type[TestCase]:
+        """
+        Returns the TestCase class for this phase (importing it if needed).
+        """
+        module_name, class_name = self.value.split(':')
+        return cast(Type[TestCase],
+                    getattr(import_module(module_name), class_name))
+
+    def __init__(self, _: str) -> None:
+        self._cli_name = self.name.lower()  # pylint: disable=E1101
 
     def __str__(self) -> str:
-        return self.name.lower()  # pylint: disable=E1101
+        return self._cli_name
+
+
+# Phases by the name used to select them on the command line
+_PHASE_BY_NAME = {str(p): p for p in Phase}
+
+# The phase names in definition order (for --help and error messages, since
+# dicts are unordered before Python 3.6)
+_PHASE_NAMES = [str(p) for p in Phase]
 
 
 def main() -> None:
@@ -47,16 +68,27 @@ def main() -> None:
     args = _get_args()
 
     test_runner = TextTestRunner(verbosity=args.verbosity)
-    test_suite = TestSuite([p(name=method, **args.__dict__)
-                            for p in args.phases
-                            for method in _get_test_case_names(p)])
+    # Everything besides the harness's own options is passed on to the tests
+    test_case_args = {k: v for k, v in vars(args).items()
+                      if k not in ('phases', 'verbosity', 'jobs')}
+
+    tests = []  # type: List[TestCase]
+    for phase in args.phases:
+        test_case = phase.test_case
+        create_test = partial(test_case, **test_case_args)
+        tests.extend(create_test(name=method)
+                     for method in _get_test_case_names(test_case))
+
+    if args.jobs == 1:
+        test_suite = TestSuite(tests)
+    else:
+        test_suite = ParallelTestSuite(tests, jobs=args.jobs)
 
     test_runner.run(test_suite)
 
 
 def _get_test_case_names(test_case: Type[TestCase]) -> List[str]:
-    fake_case = test_case(name='runTest', runner=None)  # type: ignore
-    return list(defaultTestLoader.getTestCaseNames(fake_case))  # type: ignore
+    return list(defaultTestLoader.getTestCaseNames(test_case))
 
 
 def _get_args() -> Namespace:
@@ -88,12 +120,16 @@ def _get_args() -> Namespace:
     # interaction between type, choices, nargs='*', and default=[]:
     # https://bugs.python.org/issue9625
     parser.add_argument('phases', type=_parse_phase, nargs='*',
-                        default=list(Phase), metavar=','.join(map(str, Phase)),
+                        default=list(Phase), metavar=','.join(_PHASE_NAMES),
                         help='phases of the compiler to test (default: all)')
 
     parser.add_argument('-v', dest='verbosity', action='store_const', const=2,
                         default=1, help='verbose test output')
 
+    parser.add_argument('-j', '--jobs', type=_parse_jobs, default=1,
+                        metavar='N', help='run N tests at once (default: 1, '
+                                          'use 0 for the number of CPUs)')
+
     return parser.parse_args()
 
 
@@ -114,11 +150,24 @@ def _make_runner(path: str) -> Runner:
         raise ArgumentTypeError(msg)
 
 
+def _parse_jobs(jobs: str) -> int:
+    try:
+        value = int(jobs)
+    except ValueError:
+        value = -1
+
+    if value < 0:
+        raise ArgumentTypeError("invalid number of jobs: {} (must be a "
+                                "non-negative integer)".format(repr(jobs)))
+
+    return value or cpu_count() or 1
+
+
 def _parse_phase(name: str) -> Phase:
     try:
-        return Phase[name.upper()]
+        return _PHASE_BY_NAME[name.lower()]
     except KeyError:
-        choices = ', '.join(map(repr, map(str, Phase)))
+        choices = ', '.join(map(repr, _PHASE_NAMES))
         raise ArgumentTypeError("invalid choice: {} (choose from {})"
                                 .format(repr(name), choices))
 
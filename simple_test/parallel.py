@@ -0,0 +1,110 @@
+"""A TestSuite that runs its tests concurrently."""
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from typing import Any, Callable, Iterable, List, Tuple, Type
+from unittest import TestCase, TestResult, TestSuite
+
+
+# TestResult methods that TestCase.run reports its progress through
+_EVENTS = ('startTest', 'stopTest', 'addError', 'addFailure', 'addSuccess',
+           'addSkip', 'addExpectedFailure', 'addUnexpectedSuccess',
+           'addSubTest', 'addDuration')
+
+
+class ParallelTestSuite(TestSuite):
+    """A TestSuite that runs up to `jobs` of its tests at once.
+
+    Each test is run against its own recording result. The recorded events are
+    then replayed onto the real result in the order that the tests were added,
+    so test output is the same as if the tests were run serially.
+
+    Tests must be independent of one another (which fixture tests are, since
+    they only read their fixture and wait on compiler subprocesses). Class and
+    module fixtures (setUpClass, setUpModule, etc.) aren't supported, so
+    running tests that define them raises a ValueError. When debugging, the
+    tests are run serially like a TestSuite.
+    """
+
+    def __init__(self, tests: Iterable[TestCase] = (), jobs: int = 1) -> None:
+        super().__init__(tests)
+
+        self.jobs = jobs
+
+    def run(self, result: TestResult,
+            debug: bool = False) -> TestResult:  # pylint: disable=W0221
+        if debug:
+            return super().run(result, debug)
+
+        tests = list(_flatten(self))
+        for test_class in {type(test) for test in tests}:
+            _check_no_fixtures(test_class)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(_run_test, test) for test in tests]
+
+            try:
+                for future in futures:
+                    if result.shouldStop:
+                        break
+
+                    for name, args in future.result():
+                        getattr(result, name)(*args)
+            finally:
+                # Don't start any remaining tests if the run was stopped early
+                # (or replaying raised, e.g. on Ctrl-C), since leaving the
+                # executor waits for every test that is still queued
+                for future in futures:
+                    future.cancel()
+
+        return result
+
+
+def _run_test(test: TestCase) -> List[Tuple[str, Tuple[Any, ...]]]:
+    recorder = _RecordingResult()
+    test(recorder)
+    return recorder.events
+
+
+def _flatten(suite: TestSuite) -> Iterable[TestCase]:
+    for test in suite:
+        if isinstance(test, TestSuite):
+            yield from _flatten(test)
+        else:
+            yield test
+
+
+def _check_no_fixtures(test_class: Type[TestCase]) -> None:
+    fixtures = [name for name in ('setUpClass', 'tearDownClass')
+                if getattr(test_class, name).__func__
+                is not getattr(TestCase, name).__func__]
+
+    module = sys.modules.get(test_class.__module__)
+    fixtures.extend(name for name in ('setUpModule', 'tearDownModule')
+                    if hasattr(module, name))
+
+    if fixtures:
+        raise ValueError("cannot run {} in parallel, it has fixtures: {}"
+                         .format(test_class.__qualname__, ', '.join(fixtures)))
+
+
+class _RecordingResult(TestResult):
+    """A TestResult that only records the events reported to it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.events = []  # type: List[Tuple[str, Tuple[Any, ...]]]
+
+
+def _make_recorder(name: str) -> Callable[..., None]:
+    def record(self: _RecordingResult, *args: Any) -> None:
+        self.events.append((name, args))
+
+    record.__name__ = name
+    return record
+
+
+for _name in _EVENTS:
+    if hasattr(TestResult, _name):  # addDuration is only in Python 3.12+
+        setattr(_RecordingResult, _name, _make_recorder(_name))
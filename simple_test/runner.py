@@ -18,12 +18,28 @@ class Runner:
     def __init__(self, sc_path: Path) -> None:
         self._sc_path = sc_path
 
+        # The harness never changes directories, so the cwd (which paths are
+        # made relative to when printing commands) only has to be found once
+        self._cwd = Path.cwd()
+
+        # Make the path to the sc binary relative to CWD, so that the output
+        # command is cleaner
+        try:
+            self._sc_relative_path = str(sc_path.relative_to(self._cwd))
+        except ValueError:
+            self._sc_relative_path = str(sc_path)
+
+        self._quoted_sc_path = shell_quote(self._sc_relative_path)
+
     @classmethod
     def create(cls, sc_path: Path) -> 'Runner':
         """Creates a new runner for a compiler at sc_path."""
-        if not sc_path.exists():
-            raise BinaryNotFoundError(sc_path)
+        # Only check whether the binary exists when it can't be executed (in
+        # the common case this costs one syscall instead of two)
         if not os.access(str(sc_path), os.X_OK):
+            if not sc_path.exists():
+                raise BinaryNotFoundError(sc_path)
+
             raise BinaryNotExecutableError(sc_path)
 
         return cls(sc_path)
@@ -77,9 +93,8 @@ class Runner:
         # Make path relative to CWD so if we have to print out the full command
         # we ran (in a failed test assertion, for example), we don't have to
         # barf out the entire absolute path
-        cwd = Path.cwd()
         try:
-            sim_file = sim_file.relative_to(cwd)
+            sim_file = sim_file.relative_to(self._cwd)
         except ValueError:
             # Suppress if sim_file can't be made relative to cwd
             pass
@@ -88,18 +103,14 @@ class Runner:
             result = run([str(self._sc_path), *args, str(sim_file)],
                          stdout=PIPE, stderr=PIPE, stdin=DEVNULL)
         else:
-            with sim_file.open() as f:
+            # The child reads straight from the file descriptor, so there's
+            # no need for Python's buffering or text decoding layers
+            with sim_file.open('rb', buffering=0) as f:
                 result = run([str(self._sc_path), *args], stdin=f, stdout=PIPE,
                              stderr=PIPE)
 
-        # Make the path to the sc binary relative to CWD, so that the output
-        # command is cleaner
-        try:
-            sc_relative_path = str(self._sc_path.relative_to(cwd))
-        except ValueError:
-            sc_relative_path = str(self._sc_path)
-
-        cmd = ' '.join(map(shell_quote, [sc_relative_path, *result.args[1:]]))
+        cmd = ' '.join([self._quoted_sc_path,
+                        *map(shell_quote, result.args[1:])])
         if as_stdin:
             cmd += " < {}".format(str(sim_file))
 
@@ -1,12 +1,10 @@
 """Tests for the scanner phase of the simple compiler."""
 
-from pathlib import Path
 from typing import Any
 from unittest import main
 
 from simple_test.fixtures import Fixture
 from simple_test.fixtured_test_case import FixturedTestCase
-from simple_test.runner import Result
 
 
 class TestCST(FixturedTestCase, phase_name='cst'):
@@ -18,12 +16,6 @@ class TestCST(FixturedTestCase, phase_name='cst'):
 
     # TODO: randomized fuzzing tests  # pylint: disable=W0511
 
-    def run_phase(self, sim_file: Path, as_stdin: bool = False) -> Result:
-        """
-        Run the CST phase of the simple compiler.
-        """
-        return self.runner.run_cst(sim_file, as_stdin)
-
     def assertFixture(self, fixture: Fixture) -> None:
         """
         Asserts that the simple compiler when run under the fixture's phase and
@@ -36,8 +28,7 @@ class TestCST(FixturedTestCase, phase_name='cst'):
             self.skipTest('valid CST fixture may not be semantically valid, '
                           'skipping due to --skip-cst-passes')
 
-        self.assertFixtureAsArgument(fixture)
-        self.assertFixtureAsStdin(fixture)
+        super().assertFixture(fixture)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,8 @@
 """Tests for the scanner phase of the simple compiler."""
 
-from pathlib import Path
 from unittest import main
 
 from simple_test.fixtured_test_case import FixturedTestCase
-from simple_test.runner import Result
 
 
 class TestScanner(FixturedTestCase, phase_name='scanner'):
@@ -12,12 +10,6 @@ class TestScanner(FixturedTestCase, phase_name='scanner'):
 
     # TODO: randomized fuzzing tests  # pylint: disable=W0511
 
-    def run_phase(self, sim_file: Path, as_stdin: bool = False) -> Result:
-        """
-        Run the scanner phase of the simple compiler.
-        """
-        return self.runner.run_scanner(sim_file, as_stdin)
-
 
 if __name__ == '__main__':
     main()
@@ -2,21 +2,45 @@
 
 from contextlib import contextmanager
 from difflib import unified_diff as _unified_diff
+from itertools import chain, islice, zip_longest
 import re
-from typing import Generator
+from typing import Any, Generator, Iterator, List  # noqa  # pylint: disable=W0611
+
+
+# Outputs larger than this (in characters) are compared line by line instead
+# of with difflib, which can take minutes on large inputs that differ slightly
+_MAX_DIFF_SIZE = 64 * 1024
+
+# The number of lines shown from where such outputs start to differ
+_COARSE_DIFF_LINES = 20
+
+# ANSI terminal colors for the lines of a diff (by their first character)
+_RESET = '\033[0;0m'
+_DIFF_LINE_COLORS = {
+    '+': '\033[1;32m',  # green
+    '-': '\033[1;31m',  # red
+    '@': '\033[1;34m',  # blue
+}
+
+# An INTEGER value (or ARRAY length) in symbol table output
+_VALUE_RE = re.compile(r'^(( *)(value|length):)$\n\2  (\d+)', re.MULTILINE)
 
 
 @contextmanager
-def assertion_context(context: str) -> Generator:
+def assertion_context(context: str, *args: Any) -> Generator:
     """
     Helper context that prepends all AssertionErrors encountered within the
     context with some prefix string. Useful in tests to add the same context
     information to many assertions.
+
+    If args are given, the prefix is `context.format(*args)`. It is only
+    formatted if an AssertionError is actually raised.
     """
     try:
         yield
     except AssertionError as e:
-        e.args = ("{}{}".format(context, e.args[0]),)
+        prefix = context.format(*args) if args else context
+        e.args = ("{}{}".format(prefix, e.args[0]),)
         raise
 
 
@@ -27,11 +51,18 @@ def unified_diff(a: str, b: str,  # pylint: disable=C0103
     Performs a unified diff of a and b (with optional filenames fromfile and
     tofile, respectively). If `color` is True, the returned diff is colored
     using ANSI terminal colors.
+
+    If a or b is very large, only a coarse line by line comparison starting
+    at the first differing line is returned (see `_coarse_diff`).
     """
     a_lines = a.splitlines(keepends=True)
     b_lines = b.splitlines(keepends=True)
 
-    diff = _unified_diff(a_lines, b_lines, fromfile=fromfile, tofile=tofile)
+    if max(len(a), len(b)) > _MAX_DIFF_SIZE:
+        diff = _coarse_diff(a_lines, b_lines, fromfile, tofile)
+    else:
+        diff = _unified_diff(a_lines, b_lines, fromfile=fromfile,
+                             tofile=tofile)
 
     if color:
         diff = map(_color_diff_line, diff)
@@ -39,30 +70,43 @@ def unified_diff(a: str, b: str,  # pylint: disable=C0103
     return ''.join(diff)
 
 
-def _color_diff_line(line: str) -> str:
-    if line[0] == '+':
-        return _green(line)
-    elif line[0] == '-':
-        return _red(line)
-    elif line[0] == '@':
-        return _blue(line)
+def _coarse_diff(a_lines: List[str], b_lines: List[str], fromfile: str,
+                 tofile: str) -> Iterator[str]:
+    # Only the lines up to the first difference (and the few shown after it)
+    # are compared
+    pairs = zip_longest(a_lines, b_lines)
+    for start, (a, b) in enumerate(pairs):
+        if a != b:
+            break
+    else:
+        return
 
-    return line
+    yield '--- {}\n'.format(fromfile)
+    yield '+++ {}\n'.format(tofile)
+    yield '@@ -{0} +{0} @@ output too large to diff, comparing line by ' \
+        'line\n'.format(start + 1)
 
+    shown = chain([(a, b)], islice(pairs, _COARSE_DIFF_LINES - 1))
+    for a, b in shown:
+        if a == b:
+            yield ' ' + a
+            continue
 
-def _green(text: str) -> str:
-    return "\033[1;32m{}\033[0;0m".format(text)
+        if a is not None:
+            yield '-' + a
+        if b is not None:
+            yield '+' + b
 
 
-def _red(text: str) -> str:
-    return "\033[1;31m{}\033[0;0m".format(text)
+def _color_diff_line(line: str) -> str:
+    color = _DIFF_LINE_COLORS.get(line[0])
 
+    if color is None:
+        return line
 
-def _blue(text: str) -> str:
-    return "\033[1;34m{}\033[0;0m".format(text)
+    return color + line + _RESET
 
 
 def replace_values_with_fives(symbol_table_output: str) -> str:
     """Replaces all INTEGER values in symbol table output with 5's."""
-    return re.sub(r'^(( *)(value|length):)$\n\2  (\d+)', r'\1\n\2  5',
-                  symbol_table_output, flags=re.MULTILINE)
+    return _VALUE_RE.sub(r'\1\n\2  5', symbol_table_output)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import json
+import os
 from pathlib import Path
 import sys
 
@@ -8,34 +9,38 @@ import sys
 def main():
     directory = (Path(__file__) / '..').resolve()  # pylint: disable=E1101
 
-    arguments = directory / 'arguments'
-    stdin = directory / 'stdin'
-    stdout = directory / 'stdout'
-    stderr = directory / 'stderr'
-
-    # Use second variant of files if this is our section invocation (the one
-    # where the file is passed in via stdin instead of CLI arg)
-    if arguments.exists() or stdin.exists():
-        arguments = arguments.with_suffix('.2')
-        stdin = stdin.with_suffix('.2')
-        stdout = stdout.with_suffix('.2')
-        stderr = stderr.with_suffix('.2')
-
-    # Write out CLI args
-    with arguments.open('w') as f:
-        json.dump(sys.argv[1:], f)
-
-    # Write out stdin
-    with stdin.open('w') as f:
-        f.write(sys.stdin.read())
-
-    # Return faked stdout
-    with stdout.open() as f:
-        sys.stdout.write(f.read())
-
-    # Return faked stderr
-    with stderr.open() as f:
-        sys.stderr.write(f.read())
+    # The faked {stdout, stderr} to print, and where to record the {arguments,
+    # stdin} the dummy compiler received (one JSON file each, so that each
+    # invocation only opens two files)
+    output = directory / 'output'
+    received = directory / 'input'
+
+    # Use second variant of files if this is the invocation where the file is
+    # passed in via stdin instead of CLI arg (the harness runs both invocations
+    # concurrently, so we can't rely on the order they arrive in)
+    if not sys.argv[-1].endswith('.sim'):
+        output = output.with_suffix('.2')
+        received = received.with_suffix('.2')
+
+    # Write out CLI args and stdin
+    with received.open('w') as f:
+        json.dump({'arguments': sys.argv[1:], 'stdin': sys.stdin.read()}, f)
+
+    with output.open() as f:
+        faked = json.load(f)
+
+    # Return faked stdout and stderr (written straight to the file
+    # descriptors, skipping sys.stdout's text and buffering layers)
+    write_fd(sys.stdout.fileno(), faked['stdout'])
+    write_fd(sys.stderr.fileno(), faked['stderr'])
+
+
+def write_fd(fd, text):
+    data = memoryview(text.encode('utf8'))
+
+    # Writes to a pipe may be partial
+    while data:
+        data = data[os.write(fd, data):]
 
 
 if __name__ == '__main__':
@@ -1,19 +1,32 @@
 # pylint: disable=W0613
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from importlib import import_module
 import json
+from os import access, cpu_count, scandir, unlink, X_OK
 from pathlib import Path
 import re
 from shutil import copyfile, rmtree
 from tempfile import mkdtemp
+from threading import local
 from unittest import TestCase
 from unittest.mock import call
 
-from simple_test.fixtures import discover_fixtures
+from simple_test.fixtures import discover_fixtures_by_phase
 from simple_test.runner import Runner
 from tests.utils import slow_test
 
 
+_CALL_RE = re.compile(r'^call')
+
+_DUMMY_COMPILER = Path(__file__).resolve().parent / 'dummy_compiler.py'
+
+# Where FakeCompilerContext tries to put the dummy compiler (see _temp_root)
+_TMPFS = '/dev/shm'
+
+
 class PhaseTestBase(TestCase):
     """A base class that can integration test a FixturedTestCases.
 
@@ -22,6 +35,22 @@ class PhaseTestBase(TestCase):
     (has stdout and stderr that are mocked and reports the arguments and stdin
     it receives) against a TestCase.
     """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # Each worker thread sets up its own dummy compiler (so concurrent runs
+        # don't overwrite each other's outputs), which is then reused for
+        # every fixture that thread checks (it is reset by fake_output)
+        cls._local = local()
+        cls._fake_compilers = ExitStack()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._fake_compilers.close()
+
+        super().tearDownClass()
+
     @slow_test
     def test_tests_pass_for_dummy_compiler(self):
         # unittest discover will pick up this base class, so we skip it when it
@@ -36,29 +65,58 @@ class PhaseTestBase(TestCase):
         assert hasattr(self, 'sc_args'), \
             'specify sc_args in the PhaseTestBase child'
 
-        with FakeCompilerContext() as fake_compiler:
-            phase_name = self.phase_name  # noqa  # pylint: disable=E1101
-            fixtures = [f for f in discover_fixtures()
-                        if f.phase_name == phase_name]
-            if not fixtures:
-                self.fail("{} will not assert anything because there are no "
-                          "*.{} phase files in fixtures/"
-                          .format(self.__class__.__name__, phase_name))
-
-            test_case_args = [{}] + getattr(self, 'extra_test_case_args', [])
-            cases_under_test = self.cases_under_test  # noqa  # pylint: disable=E1101
-            test_case_name = cases_under_test.split('.')[-1]
-
+        phase_name = self.phase_name  # noqa  # pylint: disable=E1101
+        fixtures = discover_fixtures_by_phase().get(phase_name, [])
+        if not fixtures:
+            self.fail("{} will not assert anything because there are no "
+                      "*.{} phase files in fixtures/"
+                      .format(self.__class__.__name__, phase_name))
+
+        test_case_args = [{}] + getattr(self, 'extra_test_case_args', [])
+        cases_under_test = self.cases_under_test  # noqa  # pylint: disable=E1101
+        test_case_name = cases_under_test.split('.')[-1]
+
+        # The fixtures are checked concurrently, but subTest isn't thread-safe,
+        # so the outcome of each is reported back here in order
+        with ThreadPoolExecutor(max_workers=cpu_count() or 1) as executor:
+            checks = []
             for args in test_case_args:
-                test_case_call = re.sub(r'^call', test_case_name,
-                                        repr(call(**args)))
+                test_case_call = _CALL_RE.sub(test_case_name,
+                                              repr(call(**args)))
                 for fixture in fixtures:
                     subtest_name = "{} - {}".format(test_case_call,
                                                     fixture.name)
+                    future = executor.submit(self._check_fixture, fixture,
+                                             args)
+                    checks.append((subtest_name, future))
+
+            for subtest_name, future in checks:
+                with self.subTest(subtest_name):
+                    error = future.result()
+                    if error is not None:
+                        raise error
+
+    def _check_fixture(self, fixture, test_case_args):
+        """
+        Runs assertTestCaseWithArgsPassesFixture with this thread's fake
+        compiler, returning the exception it raised (if any).
+        """
+        try:
+            self.assertTestCaseWithArgsPassesFixture(self._get_fake_compiler(),
+                                                     fixture, test_case_args)
+        except Exception as e:  # pylint: disable=W0703
+            return e
 
-                    with self.subTest(subtest_name):
-                        self.assertTestCaseWithArgsPassesFixture(fake_compiler,
-                                                                 fixture, args)
+        return None
+
+    def _get_fake_compiler(self):
+        fake_compiler = getattr(self._local, 'fake_compiler', None)
+        if fake_compiler is None:
+            fake_compiler = \
+                self._fake_compilers.enter_context(FakeCompilerContext())
+            self._local.fake_compiler = fake_compiler
+
+        return fake_compiler
 
     def assertTestCaseWithArgsPassesFixture(self, fake_compiler, fixture,
                                             test_case_args):
@@ -172,8 +230,7 @@ class PhaseTestBase(TestCase):
         #       the unittest package does its discovery, it won't slurp up this
         #       TestCase that we import.
         fqn = self.__class__.cases_under_test  # noqa  # pylint: disable=E1101
-        cases_module, class_name = fqn.rsplit('.', 1)
-        test_cases_class = getattr(import_module(cases_module), class_name)
+        test_cases_class = _load_class(fqn)
         test_cases = test_cases_class(runner=Runner(fake_compiler.sc_path),
                                       **test_case_args)
 
@@ -190,9 +247,7 @@ class PhaseTestBase(TestCase):
                                           test_case_args):
         base_args = self.__class__.sc_args  # pylint: disable=E1101
 
-        cwd = Path('.').resolve()
-        sim_file_path = str(fixture.sim_file_path.relative_to(cwd))
-
+        sim_file_path = _relative_path(fixture.sim_file_path)
         argument_call = FakeCompilerCall([*base_args, sim_file_path], '')
 
         self.assertEqual(argument_call, fake_compiler.get_first_input())
@@ -201,91 +256,135 @@ class PhaseTestBase(TestCase):
                                        test_case_args):
         base_args = self.__class__.sc_args  # pylint: disable=E1101
 
-        with fixture.sim_file_path.open() as f:
-            stdin_call = FakeCompilerCall(list(base_args), f.read())
+        sim_file = _read_text(fixture.sim_file_path)
+        stdin_call = FakeCompilerCall(list(base_args), sim_file)
 
         self.assertEqual(stdin_call, fake_compiler.get_second_input())
 
 
+@lru_cache(maxsize=None)
+def _load_class(fqn):
+    """Imports the class with the given fully-qualified name."""
+    module_name, class_name = fqn.rsplit('.', 1)
+    return getattr(import_module(module_name), class_name)
+
+
+# Fixtures are checked many times (once per fake compiler run), so their paths
+# and sim files are only processed once
+@lru_cache(maxsize=None)
+def _relative_path(path):
+    return str(path.relative_to(Path.cwd()))
+
+
+@lru_cache(maxsize=None)
+def _read_text(path):
+    return path.read_text()
+
+
+@lru_cache(maxsize=1)
+def _temp_root():
+    """
+    Returns the directory to create FakeCompilerContexts in (None for the
+    default temp directory). The dummy compiler's files are rewritten on every
+    run, so tmpfs is preferred, unless it's missing or it doesn't allow
+    executables (e.g. Docker mounts /dev/shm noexec). This is only checked
+    once, since every context would get the same answer.
+    """
+    try:
+        probe = Path(mkdtemp(dir=_TMPFS))
+    except OSError:
+        return None
+
+    try:
+        executable = probe / 'sc'
+        executable.touch(mode=0o755)
+        if access(str(executable), X_OK):
+            return _TMPFS
+    except OSError:
+        pass
+    finally:
+        rmtree(str(probe))
+
+    return None
+
+
 FakeCompilerCall = namedtuple('FakeCompilerResult', ('args', 'stdin'))
 
 
 class FakeCompilerContext:
     def __enter__(self):
-        self.directory = Path(mkdtemp())
+        self.directory = Path(mkdtemp(dir=_temp_root()))
 
         # Setup dummy compiler
-        directory = (Path(__file__) / '..').resolve()  # pylint: disable=E1101
         self.sc_path = self.directory / 'sc'
-        copyfile(str(directory / 'dummy_compiler.py'), str(self.sc_path))
-        self.sc_path.chmod(0o755)  # pylint: disable=E1101
-
-        # Paths to input/output files for dummy compiler
-        self.arguments_files = [
-            self.directory / 'arguments',
-            self.directory / 'arguments.2',
-        ]
-        self.stdin_files = [
-            self.directory / 'stdin',
-            self.directory / 'stdin.2',
+        try:
+            copyfile(str(_DUMMY_COMPILER), str(self.sc_path))
+            self.sc_path.chmod(0o755)  # pylint: disable=E1101
+        except BaseException:
+            rmtree(str(self.directory))
+            raise
+
+        # Paths to input/output files for dummy compiler (the second of each
+        # is for the invocation with the sim file passed in as stdin)
+        self.input_files = [
+            self.directory / 'input',
+            self.directory / 'input.2',
         ]
-        self.stdout_files = [
-            self.directory / 'stdout',
-            self.directory / 'stdout.2',
-        ]
-        self.stderr_files = [
-            self.directory / 'stderr',
-            self.directory / 'stderr.2',
+        self.output_files = [
+            self.directory / 'output',
+            self.directory / 'output.2',
         ]
 
         return self
 
-    # NOTE: this is dependent on the test order (pass file as argument first,
-    #       then pass file into stdin)
     def fake_output(self, arg_output, stdin_output=None):
         """
         Sets (stdout, stderr) for the fake compiler when run with the sim file
-        passed as an argument and then when run with the sim file passed in as
+        passed as an argument and when run with the sim file passed in as
         stdin. If the stdin_output tuple is not specified, the fake compiler
         will output the same stdout and stderr for both invocations.
         """
         if stdin_output is None:
             stdin_output = arg_output
 
-        for p in [*self.arguments_files, *self.stdin_files]:
-            try:
-                p.unlink()
-            except FileNotFoundError:
-                pass
+        self.reset()
 
-        output = zip(self.stdout_files, self.stderr_files,
-                     (arg_output, stdin_output))
-        for stdout_file, stderr_file, (stdout, stderr) in output:
-            with stdout_file.open('w') as f:
-                f.write(stdout)
+        for output_file, (stdout, stderr) in zip(self.output_files,
+                                                 (arg_output, stdin_output)):
+            output = json.dumps({'stdout': stdout, 'stderr': stderr})
+            output_file.write_bytes(output.encode('utf8'))
 
-            with stderr_file.open('w') as f:
-                f.write(stderr)
+    def reset(self):
+        """
+        Removes the inputs recorded by previous invocations of the fake
+        compiler, so the context can be reused without recreating it.
+        """
+        # List the directory once rather than raising FileNotFoundError for
+        # each input that wasn't written (Path.unlink(missing_ok=True) needs
+        # Python 3.8)
+        input_names = {p.name for p in self.input_files}
+        for entry in scandir(str(self.directory)):
+            if entry.name in input_names:
+                unlink(entry.path)
 
     def get_first_input(self):
         """
-        Gets the arguments and stdin from the first invocation of the fake
-        compiler.
+        Gets the arguments and stdin from the invocation of the fake compiler
+        where the sim file was passed as an argument.
         """
         return self._get_input(0)
 
     def get_second_input(self):
         """
-        Gets the arguments and stdin from the second invocation of the fake
-        compiler.
+        Gets the arguments and stdin from the invocation of the fake compiler
+        where the sim file was passed in as stdin.
         """
         return self._get_input(1)
 
     def _get_input(self, i):
-        args, stdin = self.arguments_files[i], self.stdin_files[i]
+        received = json.loads(self.input_files[i].read_bytes().decode('utf8'))
 
-        with args.open() as args_f, stdin.open() as stdin_f:
-            return FakeCompilerCall(json.load(args_f), stdin_f.read())
+        return FakeCompilerCall(received['arguments'], received['stdin'])
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         rmtree(str(self.directory))
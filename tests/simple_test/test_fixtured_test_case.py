@@ -11,7 +11,8 @@ PREFIX = 'simple_test.fixtured_test_case'
 
 class TestFixturedTestCase(TestCase):
     def test_subclassing_adds_fixture_test_methods(self):
-        with patch("{}.discover_fixtures".format(PREFIX)) as discover_fixtures:
+        with patch("{}.discover_fixtures_by_phase".format(PREFIX)) \
+                as discover_fixtures_by_phase:
 
             fixtures = [
                 _make_fixture(name='bar', phase_name='foo'),
@@ -20,7 +21,10 @@ class TestFixturedTestCase(TestCase):
             ]
             runner = Mock()
 
-            discover_fixtures.return_value = fixtures
+            discover_fixtures_by_phase.return_value = {
+                'foo': [fixtures[0], fixtures[2]],
+                'bat': [fixtures[1]],
+            }
 
             class DummyTestCase(FixturedTestCase, phase_name='foo'):
                 def run_phase(self, sim_file, as_stdin=False):
@@ -32,6 +36,7 @@ class TestFixturedTestCase(TestCase):
             self.assertEqual(runner, test_case.runner)
             self.assertHasMethod('test_bar', test_case)
             self.assertHasMethod('test_cat', test_case)
+            self.assertFalse(hasattr(test_case, 'test_baz'))
 
             # Assert these methods properly delegate to assertFixture
             test_case.assertFixture = Mock()
@@ -45,13 +50,14 @@ class TestFixturedTestCase(TestCase):
             test_case.assertFixture.reset_mock()
 
     def test_subclassing_with_method_name_collision(self):
-        with patch("{}.discover_fixtures".format(PREFIX)) as discover_fixtures:
+        with patch("{}.discover_fixtures_by_phase".format(PREFIX)) \
+                as discover_fixtures_by_phase:
 
             fixtures = [
                 _make_fixture(name='foo', phase_name='bar'),
             ]
 
-            discover_fixtures.return_value = fixtures
+            discover_fixtures_by_phase.return_value = {'bar': fixtures}
 
             error = r'replace existing test method: test_foo'
             with self.assertRaisesRegex(AssertionError, error):
@@ -63,6 +69,42 @@ class TestFixturedTestCase(TestCase):
                     def run_phase(self, sim_file, as_stdin=False):
                         raise NotImplementedError
 
+    def test_run_phase_dispatches_on_phase_name(self):
+        with patch("{}.discover_fixtures_by_phase".format(PREFIX)) \
+                as discover_fixtures_by_phase:
+
+            discover_fixtures_by_phase.return_value = {}
+
+            class DummyTestCase(FixturedTestCase, phase_name='foo'):
+                PHASE_DISPATCH = {'foo': 'run_foo'}
+
+            runner = Mock()
+            sim_file = Mock()
+
+            result = DummyTestCase(runner).run_phase(sim_file, True)
+
+            self.assertEqual(runner.run_foo.return_value, result)
+            runner.run_foo.assert_called_once_with(sim_file, True)
+
+    def test_subclassing_with_unknown_phase_name(self):
+        with patch("{}.discover_fixtures_by_phase".format(PREFIX)) \
+                as discover_fixtures_by_phase:
+
+            discover_fixtures_by_phase.return_value = {}
+
+            with self.assertRaisesRegex(AssertionError,
+                                        r'no runner for phase .*: bar'):
+                class UnknownTestCase(FixturedTestCase,  # noqa  # pylint: disable=W0612
+                                      phase_name='bar'):
+                    pass
+
+            # Unless the subclass knows how to run the phase itself
+            class OverridingTestCase(FixturedTestCase, phase_name='bar'):
+                def run_phase(self, sim_file, as_stdin=False):
+                    return self.runner.bar(sim_file, as_stdin)
+
+            self.assertEqual('bar', OverridingTestCase.phase_name)
+
     def assertHasMethod(self, name, obj):
         if not callable(getattr(obj, name, None)):
             self.fail("{}.{} should be a method".format(obj.__class__.__name__,
@@ -83,7 +125,8 @@ class TestFixturedTestCaseAssertions(TestCase):
 
         self.sim_file_path = Mock()
         self.expected_stdout = Mock()
-        self.phase_file = Mock(autospec=PhaseFile, stdout=self.expected_stdout)
+        self.phase_file = Mock(autospec=PhaseFile,
+                               stdout_bytes=self.expected_stdout)
         self.stdout = Mock()
         self.stdout_str = 'stdout!'
         self.stderr = Mock()
@@ -108,6 +151,17 @@ class TestFixturedTestCaseAssertions(TestCase):
         self.test_case.assertFixtureAsStdin \
             .assert_called_once_with(self.fixture)
 
+    def test_assertFixture_stdin_failure(self):
+        self.test_case.assertFixtureAsArgument = Mock()
+        self.test_case.assertFixtureAsStdin = \
+            Mock(side_effect=AssertionError('P = NP'))
+
+        with self.assertRaisesRegex(AssertionError, 'P = NP'):
+            self.test_case.assertFixture(self.fixture)
+
+        self.test_case.assertFixtureAsArgument \
+            .assert_called_once_with(self.fixture)
+
     def test_assertFixtureAsArgument(self):
         self.runner.foo.return_value = self.result
         self.test_case.assertFixtureOutput = Mock()
@@ -159,68 +213,58 @@ class TestFixturedTestCaseAssertions(TestCase):
                                      self.stderr)
 
     def test_assertFixtureStderr_expected_error(self):
-        self.assertStderrAssertionSucceeds(True, 'error: stuff\n')
+        self.assertStderrAssertionSucceeds(True, b'error: stuff\n')
 
     def test_assertFixtureStderr_unexpected_and_no_error(self):
-        self.assertStderrAssertionSucceeds(False, '')
+        self.assertStderrAssertionSucceeds(False, b'')
 
     def assertStderrAssertionSucceeds(self, has_error, stderr):
         self.phase_file.has_error = has_error
-        self.stderr.decode.return_value = stderr
+        self.result.stderr = stderr
 
         self.test_case.assertFixtureStderr(self.phase_file, self.result)
-        self.stderr.decode.assert_called_once_with('utf8')
+        self.stdout.decode.assert_not_called()
 
     def test_assertFixtureStderr_expected_but_no_error(self):
-        stderr = ''
-        error = 'at least one error.*\n\nstdout.*:\n\n{}\n\nstderr.*:\n\n{}' \
-            .format(self.stdout_str, stderr)
+        stderr = b''
+        error = 'at least one error.*\n\nstdout.*:\n\n{}\n\nstderr.*:\n\n$' \
+            .format(self.stdout_str)
 
         self.assertStderrAssertionFails(True, stderr, error)
 
     def test_assertFixtureStderr_unexpected_error(self):
-        stderr = 'error: unexpected!\n'
+        stderr = b'error: unexpected!\n'
         error = 'expected no error.*\n\nstdout.*:\n\n{}\n\nstderr.*:\n\n{}' \
-            .format(self.stdout_str, stderr)
+            .format(self.stdout_str, 'error: unexpected!\n')
 
         self.assertStderrAssertionFails(False, stderr, error)
 
     def assertStderrAssertionFails(self, has_error, stderr, assertion_regex):
         with self.assertRaisesRegex(AssertionError, assertion_regex):
             self.phase_file.has_error = has_error
-            self.stderr.decode.return_value = stderr
+            self.result.stderr = stderr
 
             self.test_case.assertFixtureStderr(self.phase_file, self.result)
 
         self.stdout.decode.assert_called_once_with('utf8')
-        self.stderr.decode.assert_called_once_with('utf8')
 
     def test_assertStdoutEqual_equal(self):
-        value = Mock()
-        encoded_value = Mock()
-        encoded_value.decode.return_value = value
-
-        self.test_case.assertStdoutEqual(value, encoded_value, self.stderr)
-        encoded_value.decode.assert_called_with('utf8')
+        self.test_case.assertStdoutEqual(b'foo\n', b'foo\n', self.stderr)
+        self.stderr.decode.assert_not_called()
 
     def test_assertStdoutEqual_not_equal(self):
         with patch("{}.unified_diff".format(PREFIX)) as unified_diff, \
              patch("{}.sys.stdout.isatty".format(PREFIX)) as isatty:
-            expected = Mock()
-            actual = Mock()
-            actual_str = Mock()
-
-            actual.decode.return_value = actual_str
             unified_diff.return_value = 'diff return!'
 
             error = "wrong stdout:\n{}\n\nstderr was:\n\n{}" \
                 .format(unified_diff.return_value, self.stderr_str)
             with self.assertRaisesRegex(AssertionError, error):
-                self.test_case.assertStdoutEqual(expected, actual, self.stderr)
+                self.test_case.assertStdoutEqual(b'foo\n', b'bar\n',
+                                                 self.stderr)
 
-            actual.decode.assert_called_with('utf8')
             self.stderr.decode.assert_called_with('utf8')
-            unified_diff.assert_called_with(expected, actual_str,
+            unified_diff.assert_called_with('foo\n', 'bar\n',
                                             fromfile='expected_stdout',
                                             tofile='actual_stdout',
                                             color=isatty.return_value)
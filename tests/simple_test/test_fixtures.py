@@ -1,9 +1,13 @@
+from contextlib import contextmanager
+import os
 from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
 from unittest import main, TestCase
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 from simple_test.fixtures import FIXTURES, Fixture, PhaseFile, \
-    discover_fixtures
+    discover_fixtures, discover_fixtures_by_phase
 
 
 class TestFixture(TestCase):
@@ -22,14 +26,41 @@ class TestFixture(TestCase):
             phase_file = Mock()
             PhaseFile_.load.return_value = phase_file
 
+            self.assertEqual(phase_file, fixture.phase_file)
             self.assertEqual(phase_file, fixture.phase_file)
 
-            PhaseFile_.load.assert_called_with(path)
+            PhaseFile_.load.assert_called_once_with(path)
 
     def test_name_for_subdirectory_path(self):
         fixture = Fixture(FIXTURES / 'foo' / 'bar.phase')
         self.assertEqual('foo_bar', fixture.name)
 
+    def test_precomputed_relative_path(self):
+        fixture = Fixture(Path('/elsewhere/foo/bar.phase'), 'foo/bar.phase')
+
+        self.assertEqual('foo_bar', fixture.name)
+        self.assertEqual('phase', fixture.phase_name)
+        self.assertEqual(Path('/elsewhere/foo/bar.sim'),
+                         fixture.sim_file_path)
+        self.assertEqual(Path('foo/bar.sim'), fixture.relative_sim_file_path)
+
+    def test_not_in_fixtures_dir(self):
+        with self.assertRaisesRegex(ValueError, 'not in the fixtures dir'):
+            Fixture(Path('/elsewhere/foo.phase'))
+
+    def test_sibling_of_fixtures_dir(self):
+        sibling = FIXTURES.with_name(FIXTURES.name + '_other')
+
+        with self.assertRaisesRegex(ValueError, 'not in the fixtures dir'):
+            Fixture(sibling / 'foo.phase')
+
+    def test_equality(self):
+        path = FIXTURES / 'foo.phase'
+
+        self.assertEqual(Fixture(path), Fixture(path))
+        self.assertEqual(hash(Fixture(path)), hash(Fixture(path)))
+        self.assertNotEqual(Fixture(path), Fixture(path.with_suffix('.other')))
+
 
 class TestPhaseFile(TestCase):
     def test_load_no_errors(self):
@@ -38,90 +69,167 @@ class TestPhaseFile(TestCase):
     def test_load_with_errors(self):
         self.assertLoads("a\nb\nerror: foo\nc\n", "a\nb\nc\n", True)
 
+    def test_load_with_leading_error(self):
+        self.assertLoads("error: foo\na\n", "a\n", True)
+
+    def test_load_with_error_without_newline(self):
+        self.assertLoads("a\nerror: foo", "a\n", True)
+
+    def test_load_with_error_not_at_line_start(self):
+        self.assertLoads("a error: foo\n", "a error: foo\n", False)
+
+    def test_load_with_crlf_newlines(self):
+        self.assertLoads("a\r\nerror: foo\r\nb\rc\r\n", "a\nb\nc\n", True)
+
+    def test_load_crlf_fixture(self):
+        directory = Path(mkdtemp())
+        self.addCleanup(rmtree, str(directory))
+
+        # e.g. a phase file checked out with core.autocrlf
+        path = directory / 'foo.scanner'
+        path.write_bytes(b'identifier<a>@(0, 0)\r\n'
+                         b'error: bad\r\n'
+                         b'eof@(2, 0)\r\n')
+
+        phase_file = PhaseFile.load(path)
+
+        self.assertEqual('identifier<a>@(0, 0)\neof@(2, 0)\n',
+                         phase_file.stdout)
+        self.assertEqual(b'identifier<a>@(0, 0)\neof@(2, 0)\n',
+                         phase_file.stdout_bytes)
+        self.assertTrue(phase_file.has_error)
+
     def assertLoads(self, contents, stdout, has_error):
         path = Mock(autospec=Path)
-        file_context = MagicMock()
-        f = Mock()
-        path.open.return_value = file_context
-        file_context.__enter__.return_value = f
-        f.read.return_value = contents
+        path.read_bytes.return_value = contents.encode('utf8')
 
         phase_file = PhaseFile.load(path)
 
-        path.open.assert_called_once_with()
+        path.read_bytes.assert_called_once_with()
         self.assertEqual(stdout, phase_file.stdout)
+        self.assertEqual(stdout.encode('utf8'), phase_file.stdout_bytes)
         self.assertEqual(has_error, phase_file.has_error)
 
 
-class PathMock(type(Path('.'))):
-    def __init__(self, _, is_file=True):
-        self._is_file = is_file
+class TestDiscoverFixtures(TestCase):
+    def setUp(self):
+        self.directory = Path(mkdtemp())
 
-    def is_file(self):
-        return self._is_file
+    def tearDown(self):
+        rmtree(str(self.directory))
 
+        # Don't leak fixtures discovered from the fake directory to other tests
+        discover_fixtures.cache_clear()
+        discover_fixtures_by_phase.cache_clear()
 
-class TestDiscoverFixtures(TestCase):
     def test_discover_fixtures(self):
-        paths = [
-            PathMock('.gitkeep'),
-            PathMock('foo.sim'),
-            PathMock('foo.scanner'),
-            PathMock('foo.parser'),
-            PathMock('bar.sim'),
-            PathMock('bar.parser'),
-            PathMock('baz', is_file=False),
-            PathMock('baz/foo.sim'),
-            PathMock('baz/foo.parser'),
-            PathMock('baz/foo.code_generator'),
-        ]
+        self.make_files(['.gitkeep', 'foo.sim', 'foo.scanner', 'foo.parser',
+                         'bar.sim', 'bar.parser', 'baz/foo.sim',
+                         'baz/foo.parser', 'baz/foo.code_generator'])
 
-        discovered = self.discover_fixtures(paths)
+        discovered = self.discover_fixtures()
 
         fixtures = [
-            Fixture(paths[2]),
-            Fixture(paths[3]),
-            Fixture(paths[5]),
-            Fixture(paths[8]),
-            Fixture(paths[9]),
+            self.make_fixture('foo.scanner'),
+            self.make_fixture('foo.parser'),
+            self.make_fixture('bar.parser'),
+            self.make_fixture('baz/foo.parser'),
+            self.make_fixture('baz/foo.code_generator'),
         ]
 
         self.assertCountEqual(fixtures, discovered)
+        self.assertEqual(['baz_foo', 'baz_foo'],
+                         [f.name for f in discovered
+                          if f.relative_sim_file_path == Path('baz/foo.sim')])
+
+    def test_discover_fixtures_skips_hidden_directories(self):
+        self.make_files(['foo.sim', 'foo.scanner', '.hidden/bar.scanner',
+                         '.hidden/nested/baz'])
+
+        with patch('simple_test.fixtures.os.scandir',
+                   wraps=os.scandir) as scandir:
+            discovered = self.discover_fixtures()
+
+            # The hidden directory is never listed
+            scandir.assert_called_once_with(str(self.directory))
+
+        self.assertEqual([self.make_fixture('foo.scanner')], discovered)
+
+    def test_discover_fixtures_is_cached(self):
+        self.make_files(['foo.sim', 'foo.scanner'])
+
+        with patch('simple_test.fixtures.os.scandir',
+                   wraps=os.scandir) as scandir:
+            fixtures = self.discover_fixtures()
+
+            self.assertIs(fixtures, discover_fixtures())
+            scandir.assert_called_once_with(str(self.directory))
+
+    def test_discover_fixtures_by_phase(self):
+        self.make_files(['foo.sim', 'foo.scanner', 'foo.parser', 'bar.sim',
+                         'bar.parser'])
+
+        with self.patch_fixtures_dir():
+            discover_fixtures.cache_clear()
+            discover_fixtures_by_phase.cache_clear()
+
+            self.assertEqual({
+                'scanner': [self.make_fixture('foo.scanner')],
+                'parser': [self.make_fixture('bar.parser'),
+                           self.make_fixture('foo.parser')],
+            }, discover_fixtures_by_phase())
 
     def test_discover_fixtures_unexpected_file(self):
+        self.make_files(['foo'])
+
         with self.assertRaisesRegex(AssertionError, 'unexpected fixture file'):
-            self.discover_fixtures([PathMock('foo')])
+            self.discover_fixtures()
 
     def test_discover_fixtures_sim_with_no_phases(self):
-        error = r'\.sim files have no phases:\nfoo\.sim'
+        self.make_files(['foo.sim'])
+
+        error = r'\.sim files have no phases:\n.*/foo\.sim'
         with self.assertRaisesRegex(AssertionError, error):
-            self.discover_fixtures([PathMock('foo.sim')])
+            self.discover_fixtures()
 
     def test_discover_fixtures_phase_with_no_sim(self):
-        error = r'\.sim files .* are missing:\nfoo\.sim'
+        self.make_files(['foo.scanner'])
+
+        error = r'\.sim files .* are missing:\n.*/foo\.sim'
         with self.assertRaisesRegex(AssertionError, error):
-            self.discover_fixtures([PathMock('foo.scanner')])
+            self.discover_fixtures()
 
     def test_discover_fixtures_name_collision(self):
+        self.make_files(['foo_bar.sim', 'foo_bar.scanner', 'foo/bar.sim',
+                         'foo/bar.scanner'])
+
         error = \
             r'name collision .* ' \
             r'(foo_bar\.sim and foo/bar\.sim|foo/bar\.sim and foo_bar\.sim)'
         with self.assertRaisesRegex(AssertionError, error):
-            self.discover_fixtures([
-                PathMock('foo_bar.sim'),
-                PathMock('foo_bar.scanner'),
-                PathMock('foo/bar.sim'),
-                PathMock('foo/bar.scanner'),
-            ])
-
-    def discover_fixtures(self, files):
-        with patch('simple_test.fixtures.FIXTURES',
-                   autospec=Path) as fixtures_dir:
-            fixtures_dir.glob.return_value = files
-
-            fixtures = discover_fixtures()
-            fixtures_dir.glob.assert_called_with('**/*')
-            return fixtures
+            self.discover_fixtures()
+
+    def make_fixture(self, name):
+        return Fixture(self.directory / name, name)
+
+    def make_files(self, names):
+        for name in names:
+            path = self.directory / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def discover_fixtures(self):
+        with self.patch_fixtures_dir():
+            discover_fixtures.cache_clear()
+            return discover_fixtures()
+
+    @contextmanager
+    def patch_fixtures_dir(self):
+        prefix = str(self.directory) + os.sep
+
+        with patch('simple_test.fixtures.FIXTURES', new=self.directory), \
+                patch('simple_test.fixtures._FIXTURES_PREFIX', new=prefix):
+            yield
 
 
 if __name__ == '__main__':
@@ -1,5 +1,6 @@
 from collections import OrderedDict
 from contextlib import contextmanager, redirect_stderr
+from importlib import import_module
 import io
 from pathlib import Path
 import re
@@ -12,14 +13,10 @@ from simple_test.runner import Runner, BinaryNotFoundError, \
     BinaryNotExecutableError
 
 
-PREFIX = 'simple_test.test_'
+from simple_test.main import main, Phase
 
 
-with patch(PREFIX + 'scanner.TestScanner') as TestScanner, \
-        patch(PREFIX + 'cst.TestCST') as TestCST, \
-        patch(PREFIX + 'symbol_table.TestSymbolTable') as TestSymbolTable, \
-        patch(PREFIX + 'ast.TestAST') as TestAST:
-    from simple_test.main import main
+PREFIX = 'simple_test.test_'
 
 
 # TODO:  # pylint: disable=W0511
@@ -42,6 +39,14 @@ class TestMain(TestCase):
             import TestSymbolTable as TestSymbolTable_
         from simple_test.test_ast import TestAST as TestAST_
 
+        # The phases are imported lazily by main, so the TestCases must be
+        # patched where they are defined
+        TestScanner = self.start_patch(PREFIX + 'scanner.TestScanner')
+        TestCST = self.start_patch(PREFIX + 'cst.TestCST')
+        TestSymbolTable = \
+            self.start_patch(PREFIX + 'symbol_table.TestSymbolTable')
+        TestAST = self.start_patch(PREFIX + 'ast.TestAST')
+
         # Unfortunately, it must be this way
         global ALL_TESTS  # pylint: disable=W0603
         ALL_TESTS = OrderedDict([('scanner', (TestScanner, TestScanner_)),
@@ -51,10 +56,20 @@ class TestMain(TestCase):
 
         self.reset_mocks()
 
+    def start_patch(self, target):
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
     def reset_mocks(self):
         for test_case, _ in ALL_TESTS.values():
             test_case.reset_mock()
 
+    def test_phase_test_case(self):
+        for name, (mock_class, _) in ALL_TESTS.items():
+            with self.subTest(name):
+                self.assertIs(mock_class, Phase[name.upper()].test_case)
+
     def test_main_no_args_runs_everything_with_defaults(self):
         self.assertMainRunsTests()
 
@@ -63,10 +78,28 @@ class TestMain(TestCase):
             with self.subTest(name):
                 self.assertMainRunsTests(tests=[test_class], args=[name])
 
+    def test_main_imports_each_phase_once(self):
+        with patch('simple_test.main.import_module',
+                   wraps=import_module) as import_module_:
+            self.assertMainRunsTests(tests=[ALL_TESTS['scanner']],
+                                     args=['scanner'])
+
+        import_module_.assert_called_once_with('simple_test.test_scanner')
+
+    def test_main_phase_is_case_insensitive(self):
+        self.assertMainRunsTests(tests=[ALL_TESTS['st']], args=['ST'])
+
+    def test_phase_str(self):
+        self.assertEqual(list(ALL_TESTS), [str(p) for p in Phase])
+
     def test_main_bad_phase_errors(self):
         self.assertMainFailsWithStderr('invalid choice: \'foo\'', tests=[],
                                        args=['foo'])
 
+    def test_main_bad_phase_lists_phases_in_order(self):
+        self.assertMainFailsWithStderr("(choose from 'scanner', 'cst', 'st', "
+                                       "'ast')", tests=[], args=['foo'])
+
     def test_main_with_sc_runs_everything(self):
         self.assertMainRunsTests(args=['--sc', 'other/sc'], sc='other/sc')
 
@@ -99,6 +132,23 @@ class TestMain(TestCase):
                 self.assertMainRunsTests(args=args, config=config)
                 self.reset_mocks()
 
+    def test_main_jobs_runs_tests_in_parallel(self):
+        self.assertMainRunsTests(args=['-j', '4'], jobs=4)
+
+    def test_main_jobs_before_phase(self):
+        self.assertMainRunsTests(tests=[ALL_TESTS['scanner']],
+                                 args=['-j', '4', 'scanner'], jobs=4)
+
+    @patch('simple_test.main.cpu_count', return_value=8)
+    def test_main_zero_jobs_uses_cpu_count(self, _):
+        self.assertMainRunsTests(args=['-j', '0'], jobs=8)
+
+    def test_main_bad_jobs_errors(self):
+        for jobs in ['-1', 'foo', 'scanner']:
+            with self.subTest(jobs):
+                self.assertMainFailsWithStderr('invalid number of jobs',
+                                               tests=[], args=['-j', jobs])
+
     def assertMainFailsWithStderr(self, stderr, *args, **kwargs):
         f = io.StringIO()
 
@@ -110,7 +160,8 @@ class TestMain(TestCase):
 
     def assertMainRunsTests(self, tests=None, args=None, sc='./sc',
                             verbosity=1, config=None,
-                            runner_create_raises=None, expect_exit=False):
+                            runner_create_raises=None, expect_exit=False,
+                            jobs=1):
         if tests is None:
             tests = list(ALL_TESTS.values())
         if not args:
@@ -123,41 +174,47 @@ class TestMain(TestCase):
             test_suite = Mock(TestSuite)
             test_runner = Mock(TextTestRunner)
             get_tests = defaultTestLoader.getTestCaseNames
-            created_tests = [{n: MagicMock()
-                              for n in get_tests(real_class(name='runTest',
-                                                            runner=None))}
+            created_tests = [{n: MagicMock() for n in get_tests(real_class)}
                              for _, real_class in tests]
 
-            def make_half_proxy(real_class, created_tests):
+            def make_proxy(real_class, created_tests):
                 def proxy(*args, **kwargs):
                     this_call = call(*args, **kwargs)
 
-                    if this_call == call(name='runTest', runner=None):  # noqa  # pylint: disable=R1705
-                        return real_class(*args, **kwargs)
-                    else:
-                        assert kwargs['name'], \
-                            "must pass in method name, received: {}" \
-                            .format(this_call)
+                    assert kwargs.get('name'), \
+                        "must pass in method name, received: {}" \
+                        .format(this_call)
 
-                        self.assertIn(kwargs['name'], created_tests,
-                                      "must be a method on {}"
-                                      .format(real_class.__class__.__name__))
+                    self.assertIn(kwargs['name'], created_tests,
+                                  "must be a method on {}"
+                                  .format(real_class.__name__))
 
-                        self.assertEqual(subset_call(name=kwargs['name'],
-                                                     runner=runner,
-                                                     **config),
-                                         this_call)
+                    self.assertEqual(subset_call(name=kwargs['name'],
+                                                 runner=runner, **config),
+                                     this_call)
 
-                        return created_tests[kwargs['name']]
+                    for harness_option in ('phases', 'verbosity', 'jobs'):
+                        self.assertNotIn(harness_option, kwargs,
+                                         'harness options are not passed to '
+                                         'the tests')
+
+                    return created_tests[kwargs['name']]
 
                 return proxy
 
             for (mock_class, real_class), fake in zip(tests, created_tests):
-                mock_class.side_effect = make_half_proxy(real_class, fake)
+                mock_class.side_effect = make_proxy(real_class, fake)
+
+                # Test names are read off of the class (not an instance)
+                mock_class.__qualname__ = real_class.__qualname__
+                for name in fake:
+                    setattr(mock_class, name, getattr(real_class, name))
 
             with patch('simple_test.main.Runner') as Runner_, \
                     patch('simple_test.main.TextTestRunner') as TestRunner_, \
-                    patch('simple_test.main.TestSuite') as TestSuite_:
+                    patch('simple_test.main.TestSuite') as TestSuite_, \
+                    patch('simple_test.main.ParallelTestSuite') as \
+                    ParallelTestSuite_:
                 if runner_create_raises is None:
                     Runner_.create.return_value = runner
                 else:
@@ -165,6 +222,7 @@ class TestMain(TestCase):
 
                 TestRunner_.return_value = test_runner
                 TestSuite_.return_value = test_suite
+                ParallelTestSuite_.return_value = test_suite
 
                 with fake_argv(args):
                     main()
@@ -173,10 +231,21 @@ class TestMain(TestCase):
                 TestRunner_.assert_called_once_with(verbosity=verbosity)
 
                 # Assert suite was created with all of the tests requested
-                self.assertEqual(1, TestSuite_.call_count)
+                if jobs == 1:
+                    suite_class, other_suite_class = \
+                        TestSuite_, ParallelTestSuite_
+                    expected_kwargs = {}
+                else:
+                    suite_class, other_suite_class = \
+                        ParallelTestSuite_, TestSuite_
+                    expected_kwargs = {'jobs': jobs}
+
+                self.assertEqual(1, suite_class.call_count)
+                other_suite_class.assert_not_called()
 
                 all_tests = [t for ts in created_tests for t in ts.values()]
-                (passed_tests,), _ = TestSuite_.call_args
+                (passed_tests,), suite_kwargs = suite_class.call_args
+                self.assertEqual(expected_kwargs, suite_kwargs)
                 self.assertCountEqual(all_tests, passed_tests,
                                       'all tests were passed into the suite')
 
@@ -213,11 +282,14 @@ def fake_environ(new_environ):
 
 class _subset_call(type(call)):
     def __call__(self, *args, **kwargs):
-        if self.name is None:
+        # NOTE: mock renamed _Call's name attribute to _mock_name in 3.8
+        my_name = self.__dict__.get('_mock_name', self.__dict__.get('name'))
+
+        if my_name is None:
             return self.__class__(('', args, kwargs), name='()')
 
-        name = self.name + '()'
-        return self.__class__((self.name, args, kwargs), name=name,
+        name = my_name + '()'
+        return self.__class__((my_name, args, kwargs), name=name,
                               parent=self)
 
     def __eq__(self, other):
@@ -0,0 +1,203 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import StringIO
+import sys
+from threading import Barrier, Event
+from types import ModuleType
+from unittest import main, TestCase, TestResult, TestSuite, TextTestRunner, \
+    skip
+from unittest.mock import patch
+
+from simple_test.parallel import ParallelTestSuite
+
+
+class TestParallelTestSuite(TestCase):
+    def test_run_reports_results_in_order(self):
+        class Example(TestCase):
+            def test_pass(self):
+                pass
+
+            def test_fail(self):
+                self.fail('failed')
+
+            def test_error(self):
+                raise Exception('errored')
+
+            @skip('skipped')
+            def test_skip(self):
+                pass
+
+            def test_sub_test(self):
+                with self.subTest('sub'):
+                    self.fail('sub failed')
+
+        names = ['test_pass', 'test_fail', 'test_error', 'test_skip',
+                 'test_sub_test']
+
+        serial = self.run_suite(TestSuite(map(Example, names)))
+        parallel = self.run_suite(ParallelTestSuite(map(Example, names),
+                                                    jobs=3))
+
+        self.assertEqual(serial, parallel)
+
+    def test_run_runs_tests_concurrently(self):
+        barrier = Barrier(2, timeout=5)
+
+        class Example(TestCase):
+            def test_a(self):
+                barrier.wait()
+
+            def test_b(self):
+                barrier.wait()
+
+        suite = ParallelTestSuite([Example('test_a'), Example('test_b')],
+                                  jobs=2)
+        result = TextTestRunner(stream=StringIO()).run(suite)
+
+        self.assertEqual(2, result.testsRun)
+        self.assertTrue(result.wasSuccessful())
+
+    def test_run_flattens_nested_suites(self):
+        class Example(TestCase):
+            def test_a(self):
+                pass
+
+        suite = ParallelTestSuite([TestSuite([Example('test_a')]),
+                                   Example('test_a')], jobs=2)
+        result = TextTestRunner(stream=StringIO()).run(suite)
+
+        self.assertEqual(2, result.testsRun)
+
+    def test_run_cancels_queued_tests_when_replay_raises(self):
+        ran = []
+
+        class Interrupt(Exception):
+            pass
+
+        class InterruptingResult(TestResult):
+            def addSuccess(self, test):
+                super().addSuccess(test)
+
+                if self.testsRun == 2:
+                    raise Interrupt()
+
+        with self.queued_tests(ran, 20) as suite:
+            with self.assertRaises(Interrupt):
+                suite.run(InterruptingResult())
+
+        # At most the test that was running when replay raised also ran
+        self.assertLessEqual(len(ran), 3)
+
+    def test_run_cancels_queued_tests_when_stopped(self):
+        ran = []
+
+        with self.queued_tests(ran, 20, fail_first=True) as suite:
+            result = TestResult()
+            result.failfast = True
+            suite.run(result)
+
+        self.assertEqual(1, result.testsRun)
+        self.assertLessEqual(len(ran), 3)
+
+    def test_run_with_class_fixtures_errors(self):
+        ran = []
+
+        class Example(TestCase):
+            @classmethod
+            def setUpClass(cls):
+                super().setUpClass()
+
+            def test_a(self):
+                ran.append('test_a')
+
+        suite = ParallelTestSuite([Example('test_a')], jobs=2)
+
+        with self.assertRaisesRegex(ValueError, r'fixtures: setUpClass'):
+            suite.run(TestResult())
+
+        self.assertEqual([], ran)
+
+    def test_run_with_module_fixtures_errors(self):
+        class Example(TestCase):
+            def test_a(self):
+                pass
+
+        module = ModuleType('fake_tests')
+        module.tearDownModule = lambda: None
+        Example.__module__ = module.__name__
+
+        suite = ParallelTestSuite([Example('test_a')], jobs=2)
+
+        with patch.dict(sys.modules, {module.__name__: module}):
+            with self.assertRaisesRegex(ValueError,
+                                        r'fixtures: tearDownModule'):
+                suite.run(TestResult())
+
+    def test_debug_runs_tests_serially(self):
+        ran = []
+
+        class Example(TestCase):
+            @classmethod
+            def setUpClass(cls):
+                ran.append('setUpClass')
+
+            def test_a(self):
+                ran.append('test_a')
+
+            def test_b(self):
+                self.fail('failed')
+
+        suite = ParallelTestSuite([Example('test_a'), Example('test_b')],
+                                  jobs=2)
+
+        # Unlike run, debug lets the failure propagate
+        with self.assertRaisesRegex(AssertionError, r'failed'):
+            suite.debug()
+
+        self.assertEqual(['setUpClass', 'test_a'], ran)
+
+    @staticmethod
+    @contextmanager
+    def queued_tests(ran, count, fail_first=False):
+        """
+        Creates a ParallelTestSuite (with one job) of count tests that record
+        that they ran in ran. Only the first two tests run immediately, the
+        rest are held until the suite shuts down its executor, so they are
+        still queued when the suite is stopped.
+        """
+        release = Event()
+
+        class Example(TestCase):
+            def test_queued(self):
+                index = len(ran)
+                ran.append(index)
+
+                if index >= 2:
+                    release.wait(timeout=5)
+
+                if fail_first and index == 0:
+                    self.fail('failed')
+
+        class ReleasingExecutor(ThreadPoolExecutor):
+            def shutdown(self, *args, **kwargs):
+                release.set()
+                super().shutdown(*args, **kwargs)
+
+        with patch('simple_test.parallel.ThreadPoolExecutor',
+                   ReleasingExecutor):
+            yield ParallelTestSuite([Example('test_queued')
+                                     for _ in range(count)], jobs=1)
+
+    @staticmethod
+    def run_suite(suite):
+        stream = StringIO()
+        result = TextTestRunner(stream=stream, verbosity=2).run(suite)
+
+        # Timing differs between runs, so only compare the test output
+        output = stream.getvalue().split('-' * 70 + '\nRan')[0]
+        return (output, result.testsRun, len(result.failures),
+                len(result.errors), len(result.skipped))
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,7 @@ class TestRunner(TestCase):
 
         self.assertEqual(sc_path, Runner.create(sc_path)._sc_path)  # noqa  # pylint: disable=W0212
 
-        sc_path.exists.assert_called_once_with()
+        sc_path.exists.assert_not_called()
         os.access.assert_called_once_with(path, os.X_OK)
 
     def test_create_fails_if_not_exist(self):
@@ -61,16 +61,16 @@ class TestRunner(TestCase):
         os.access.assert_called_once_with(path, os.X_OK)
 
     def test_run_simple_scanner(self):
-        self.assertRunsSimple(self.runner.run_scanner, ['-s'])
+        self.assertRunsSimple('run_scanner', ['-s'])
 
     def test_run_simple_cst(self):
-        self.assertRunsSimple(self.runner.run_cst, ['-c'])
+        self.assertRunsSimple('run_cst', ['-c'])
 
     def test_run_simple_symbol_table(self):
-        self.assertRunsSimple(self.runner.run_symbol_table, ['-t'])
+        self.assertRunsSimple('run_symbol_table', ['-t'])
 
     def test_run_simple_ast(self):
-        self.assertRunsSimple(self.runner.run_ast, ['-a'])
+        self.assertRunsSimple('run_ast', ['-a'])
 
     def assertRunsSimple(self, runner, args):
         with patch("{}.run".format(PREFIX)) as self.subprocess_run, \
@@ -131,6 +131,11 @@ class TestRunner(TestCase):
             lambda x: quoted_sc_path if x == str(unquoted_sc_path) \
             else quoted_args[x]
 
+        # The relative (and quoted) sc path is found when the runner is created
+        self.runner = Runner(self.sc_path)
+        self.sc_path.relative_to.reset_mock()
+        self.shell_quote.reset_mock()
+
         cmd = ' '.join([quoted_sc_path, *quoted_args.values()])
 
         return sim_file, relative_sim_file, cmd, stdout, stderr
@@ -142,12 +147,13 @@ class TestRunner(TestCase):
             self.setup_subprocess(relative_to_raises, sc_raises)
         last_arg = sim_file if relative_to_raises else relative_sim_file
 
-        result = runner(sim_file)
+        result = getattr(self.runner, runner)(sim_file)
 
         self.subprocess_run \
             .assert_called_once_with([str(self.sc_path), *args, str(last_arg)],
                                      stdout=PIPE, stderr=PIPE, stdin=DEVNULL)
         self.assertEqual(cmd, result.cmd)
+        self.sc_path.relative_to.assert_not_called()
         self.assertEqual(stdout, result.stdout)
         self.assertEqual(stderr, result.stderr)
 
@@ -163,13 +169,14 @@ class TestRunner(TestCase):
         fake_file_context.__enter__.return_value = fake_file
         redirected_file.open.return_value = fake_file_context
 
-        result = runner(sim_file, as_stdin=True)
+        result = getattr(self.runner, runner)(sim_file, as_stdin=True)
 
-        redirected_file.open.assert_called_once_with()
+        redirected_file.open.assert_called_once_with('rb', buffering=0)
         self.subprocess_run \
             .assert_called_once_with([str(self.sc_path), *args], stdout=PIPE,
                                      stderr=PIPE, stdin=fake_file)
         self.assertEqual("{} < {}".format(cmd, redirected_file), result.cmd)
+        self.sc_path.relative_to.assert_not_called()
         self.assertEqual(stdout, result.stdout)
         self.assertEqual(stderr, result.stderr)
 
@@ -1,4 +1,6 @@
+from itertools import zip_longest
 from unittest import main, TestCase
+from unittest.mock import Mock, patch
 
 from simple_test.utils import assertion_context, unified_diff, \
     replace_values_with_fives
@@ -19,6 +21,19 @@ class TestUtils(TestCase):
         with assertion_context('foo '):
             pass
 
+    def test_assertion_context_formats_args(self):
+        with self.assertRaisesRegex(AssertionError, 'foo 42 bar'):
+            with assertion_context('foo {} ', 42):
+                assert False, 'bar'
+
+    def test_assertion_context_with_no_raise_does_not_format(self):
+        context = Mock()
+
+        with assertion_context(context, 'arg'):
+            pass
+
+        context.format.assert_not_called()
+
     def test_unified_diff(self):
         diff = unified_diff('a\nb\n', 'a\nc\n', fromfile='foo', tofile='bar')
         self.assertEqual('--- foo\n+++ bar\n@@ -1,2 +1,2 @@\n a\n-b\n+c\n',
@@ -35,6 +50,46 @@ class TestUtils(TestCase):
                          '\033[1;32m+c\n\033[0;0m',
                          diff)
 
+    def test_unified_diff_large_outputs(self):
+        a = ''.join("line {}\n".format(i) for i in range(20000))
+        b = a.replace('line 100\n', 'changed\n')
+
+        diff = unified_diff(a, b, fromfile='foo', tofile='bar')
+
+        lines = diff.splitlines()
+        self.assertEqual(['--- foo', '+++ bar'], lines[:2])
+        self.assertRegex(lines[2], r'^@@ -101 \+101 @@ .*too large')
+        self.assertEqual(['-line 100', '+changed', ' line 101'], lines[3:6])
+        self.assertEqual(' line 119', lines[-1])
+
+    def test_unified_diff_large_outputs_stops_after_shown_lines(self):
+        a = ''.join("line {}\n".format(i) for i in range(20000))
+        b = a.replace('line 100\n', 'changed\n')
+        compared = []
+
+        def zip_longest_(*args):
+            for pair in zip_longest(*args):
+                compared.append(pair)
+                yield pair
+
+        with patch('simple_test.utils.zip_longest', zip_longest_):
+            unified_diff(a, b)
+
+        # The lines before the difference, the difference, and the 19 after
+        self.assertEqual(120, len(compared))
+
+    def test_unified_diff_large_outputs_of_different_lengths(self):
+        a = 'a\n' * 40000
+        b = a + 'b\n'
+
+        self.assertEqual('--- \n+++ \n@@ -40001 +40001 @@ output too large to '
+                         'diff, comparing line by line\n+b\n',
+                         unified_diff(a, b))
+
+    def test_unified_diff_large_equal_outputs(self):
+        a = 'a\n' * 40000
+        self.assertEqual('', unified_diff(a, a))
+
     def test_replace_values_with_fixes(self):
         self.assertEqual('value:\n  5',
                          replace_values_with_fives('value:\n  8675309'))